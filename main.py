@@ -1,6 +1,154 @@
+import functools
 import random
 import tkinter as tk
 
+# Bit mask of a board with every position taken
+FULL_BOARD = 0x1FF
+
+# Bit masks of the eight winning lines, where position i of the board is bit (1 << i)
+TOP_ROW, MIDDLE_ROW, BOTTOM_ROW = 0b000000111, 0b000111000, 0b111000000
+LEFT_COLUMN, MIDDLE_COLUMN, RIGHT_COLUMN = 0b001001001, 0b010010010, 0b100100100
+DIAGONAL, ANTI_DIAGONAL = 0b100010001, 0b001010100
+WIN_MASKS = (BOTTOM_ROW, MIDDLE_ROW, TOP_ROW,
+             RIGHT_COLUMN, MIDDLE_COLUMN, LEFT_COLUMN,
+             DIAGONAL, ANTI_DIAGONAL)
+
+# The center, corner and side positions, and the order in which moves are searched,
+# corners first like the original computer player
+CENTER_POS = 4
+CORNER_POS = (0, 2, 6, 8)
+SIDE_POS = (1, 3, 5, 7)
+MOVE_ORDER = CORNER_POS + (CENTER_POS,) + SIDE_POS
+
+# Zobrist keys for an 'X' (row 0) or 'O' (row 1) on each position and for 'O' being the side
+# to move, drawn from a fixed seed so that the keys are the same on every run
+_zobrist_random = random.Random(0)
+ZOBRIST = tuple(tuple(_zobrist_random.getrandbits(64) for _ in range(9)) for _ in range(2))
+ZOBRIST_TURN = _zobrist_random.getrandbits(64)
+
+# The winning lines passing through each position
+LINES_THROUGH = tuple(tuple(mask for mask in WIN_MASKS if (mask >> i) & 1) for i in range(9))
+
+
+def has_line(bits: int) -> bool:
+    """
+    This function will check if the positions in the bit mask complete at least one line.
+    The eight lines of WIN_MASKS are tested one by one, rows first, then diagonals, then columns.
+    """
+
+    return ((bits & TOP_ROW) == TOP_ROW
+            or (bits & MIDDLE_ROW) == MIDDLE_ROW
+            or (bits & BOTTOM_ROW) == BOTTOM_ROW
+            or (bits & DIAGONAL) == DIAGONAL
+            or (bits & ANTI_DIAGONAL) == ANTI_DIAGONAL
+            or (bits & LEFT_COLUMN) == LEFT_COLUMN
+            or (bits & MIDDLE_COLUMN) == MIDDLE_COLUMN
+            or (bits & RIGHT_COLUMN) == RIGHT_COLUMN)
+
+
+def find_threats(bits: int, other_bits: int) -> tuple:
+    """
+    This function will find, in a single pass over the lines, the position that lets the player
+    win and the position that the player has to take to stop the other player from winning.
+    Either of them is None if there is no such position.
+    """
+
+    win = block = None
+    for mask in WIN_MASKS:
+        mine = bits & mask
+        theirs = other_bits & mask
+        if not theirs and mine.bit_count() == 2:
+            if win is None:
+                win = (mask ^ mine).bit_length() - 1
+        elif not mine and theirs.bit_count() == 2:
+            if block is None:
+                block = (mask ^ theirs).bit_length() - 1
+
+    return win, block
+
+
+@functools.lru_cache(maxsize=None)
+def solve(x_bits: int, o_bits: int, turn: int, alpha: int, beta: int) -> tuple:
+    """
+    This function will search the game tree with negamax and alpha-beta pruning. It returns the
+    score of the state for the player to move ('X' if turn is 0, 'O' if turn is 1) and the best
+    move. A win scores the number of free positions left plus one so that faster wins are preferred.
+    """
+
+    bits, other_bits = (x_bits, o_bits) if turn == 0 else (o_bits, x_bits)
+    taken = x_bits | o_bits
+    free_count = 9 - taken.bit_count()
+
+    # Take the win straight away if the player can complete a line,
+    # otherwise any move but blocking the other player loses at once
+    win, block = find_threats(bits, other_bits)
+    if win is not None:
+        return free_count, win
+    candidates = MOVE_ORDER if block is None else (block,)
+
+    best_score, best_move = -10, None
+    for i in candidates:
+        if (taken >> i) & 1:
+            continue
+        if free_count == 1:
+            # The last free position ends the game with a tie
+            score = 0
+        elif turn == 0:
+            score = -solve(x_bits | (1 << i), o_bits, 1, -beta, -alpha)[0]
+        else:
+            score = -solve(x_bits, o_bits | (1 << i), 0, -beta, -alpha)[0]
+
+        if score > best_score:
+            best_score, best_move = score, i
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            break
+
+    return best_score, best_move
+
+
+def table_key(zkey: int, turn: int) -> int:
+    """
+    This function will combine the Zobrist key of a board with the side to move, where turn is 0
+    for 'X' and 1 for 'O'. It gives the key of the state in the solved move table.
+    """
+
+    return zkey ^ ZOBRIST_TURN if turn else zkey
+
+
+def build_optimal_moves() -> dict:
+    """
+    This function will solve every state that can be reached from an empty board, whoever
+    starts the game. The returned table maps the table_key of each state to the best move.
+    """
+
+    optimal_moves = dict()
+    states = [(0, 0, 0, 0), (0, 0, 1, 0)]
+
+    while states:
+        x_bits, o_bits, turn, zkey = states.pop()
+        key = table_key(zkey, turn)
+        if key in optimal_moves:
+            continue
+        optimal_moves[key] = solve(x_bits, o_bits, turn, -10, 10)[1]
+
+        # Continue with the states after every move that doesn't end the game
+        taken = x_bits | o_bits
+        for i in range(9):
+            if (taken >> i) & 1:
+                continue
+            new_x_bits = x_bits | (1 << i) if turn == 0 else x_bits
+            new_o_bits = o_bits | (1 << i) if turn == 1 else o_bits
+            new_bits = new_x_bits if turn == 0 else new_o_bits
+            if (new_x_bits | new_o_bits) != FULL_BOARD and not has_line(new_bits):
+                states.append((new_x_bits, new_o_bits, 1 - turn, zkey ^ ZOBRIST[turn][i]))
+
+    return optimal_moves
+
+
+# The perfect play move for each reachable state, keyed by its Zobrist key
+OPTIMAL_MOVE = build_optimal_moves()
+
 
 class Player:
     """This is a class for the players of the game.
@@ -18,10 +166,12 @@ class Player:
 
     Methods
     -------
-        get_computer_move(board: list, other_player)
-            Finds the best move for the computer using a simple AI
+        get_computer_move(board: Board)
+            Finds the best move for the computer from the solved game table
     """
 
+    __slots__ = ('marker', 'is_human', 'colour')
+
     def __init__(self, marker="X", is_human=True, colour='#8E44AD'):
         """This method initializes the player with three attributes.
 
@@ -38,51 +188,22 @@ class Player:
         self.is_human = is_human
         self.colour = colour
 
-    def get_computer_move(self, board: list, other_player):
-        """This method initializes the player with three attributes.
+    def get_computer_move(self, board):
+        """This method finds the best move for the computer.
 
         Parameters
         ----------
-        board : list
-            the game board
-        other_player : Player
-            the object of the other player
+        board : Board
+            the object of the game board
 
         Returns
         -------
         int
             the index of the computer's choice on the board
         """
-        move = None
-
-        # First situation: There exists a single move such that the computer can win the game.
-        if move is None:
-            move = find_winning_move(self, board)
-
-        # Second situation: There exists a single move for the player that will cause the computer to lose the game.
-        if move is None:
-            move = find_winning_move(other_player, board)
-
-        # Third situation: At least one of the corner positions (positions 0, 2, 6, or 8) is free.
-        if move is None:
-            for position in (0, 2, 6, 8):
-                if board[position // 3][position % 3] not in ('X', 'O'):
-                    move = position
-                    break
-
-        # Fourth situation: The center position (position 4) is free.
-        if move is None:
-            if board[1][1] not in ('X', 'O'):
-                move = 4
-
-        # Fifth situation: At least of the side pieces (positions 1, 3, 5, or 7) is free.
-        if move is None:
-            for position in (1, 3, 5, 7):
-                if board[position // 3][position % 3] not in ('X', 'O'):
-                    move = position
-                    break
-
-        return move
+        # The solved table counts turns by marker, 0 for 'X' and 1 for 'O'
+        turn = 0 if self.marker == 'X' else 1
+        return OPTIMAL_MOVE[table_key(board.zkey, turn)]
 
 
 class Board:
@@ -92,6 +213,12 @@ class Board:
 
     Attributes
     ----------
+        x_bits : int
+            the positions taken by the 'X' player as a bit mask
+        o_bits : int
+            the positions taken by the 'O' player as a bit mask
+        zkey : int
+            the Zobrist key of the board, updated with every move
         players : list[Player]
             a list of the players' objects
         root : tk.TK
@@ -103,6 +230,8 @@ class Board:
             Creates the game GUI.
         create_buttons(root)
             Creates the buttons of the game.
+        set_status(text: str, fg=None)
+            Shows the game status.
         make_move(position: int, player: Player)
             Show the moves made by players.
         is_position_valid(position: int)
@@ -117,9 +246,15 @@ class Board:
             Change the game status according to the button pressed by the player.
         """
 
+    __slots__ = ('x_bits', 'o_bits', 'zkey', '_ended', '_winner', '_last_status',
+                 'players', 'root', 'buttons', 'gamestatus', 'movestatus')
+
     # Indicate the game starter randomly
     turn = random.randint(0, 1)
 
+    # The computer's move announcements for each position
+    MOVE_STRINGS = tuple(f'Computer\'s move is {i}.' for i in range(9))
+
     def __init__(self, players: list[Player], root):
         """This method initializes the game board.
 
@@ -130,9 +265,13 @@ class Board:
         root : tk.TK
             the GUI root
         """
-        self.game_board = [[0, 1, 2],
-                           [3, 4, 5],
-                           [6, 7, 8]]
+        self.x_bits = 0
+        self.o_bits = 0
+        self.zkey = 0
+        self._ended = False
+        self._winner = None
+        # The text and colour the status label is created with
+        self._last_status = ('It\'s your turn.', None)
         self.players = players
         self.root = root
         self.root.title("Tic-Tac-Toe")
@@ -140,10 +279,10 @@ class Board:
 
         current_player = self.players[Board.turn]
         if not current_player.is_human:
-            move = current_player.get_computer_move(self.game_board, self.players[0])
+            move = current_player.get_computer_move(self)
             self.make_move(move, current_player)
         else:
-            self.gamestatus.config(text='Game has started.\nIt\'s your turn.')
+            self.set_status('Game has started.\nIt\'s your turn.')
 
     def create_board(self, root):
         """This method creates the game GUI.
@@ -181,24 +320,47 @@ class Board:
         Returns
         -------
         list[th.Button]
-            a list of the buttons in the game
+            a list of the buttons in the game, indexed by position
         """
         buttons = list()
 
         for i in range(3):
-            buttons.append([])
             for j in range(3):
-                buttons[i].append(tk.Button(master=root,
-                                            width=5,
-                                            height=3,
-                                            bg='white',
-                                            text=f'{i * 3 + j}',
-                                            font=('Courier', 15, 'bold'),
-                                            command=(lambda i=i, j=j: self.pressed(i * 3 + j))))
-                buttons[i][j].grid(row=i, column=j)
+                position = i * 3 + j
+                buttons.append(tk.Button(master=root,
+                                         width=5,
+                                         height=3,
+                                         bg='white',
+                                         text=f'{position}',
+                                         font=('Courier', 15, 'bold'),
+                                         command=functools.partial(self.pressed, position)))
+                buttons[-1].grid(row=i, column=j)
 
         return buttons
 
+    def set_status(self, text: str, fg=None):
+        """This method shows the game status, skipping the update if the text and colour haven't changed.
+
+        Parameters
+        ----------
+        text : str
+            the game status
+        fg : str
+            the colour of the game status text
+
+        Returns
+        -------
+        None
+        """
+        status = (text, fg)
+        if status == self._last_status:
+            return
+        self._last_status = status
+        if fg is None:
+            self.gamestatus.config(text=text)
+        else:
+            self.gamestatus.config(text=text, fg=fg)
+
     def make_move(self, position: int, player: Player):
         """This method makes the move chosen by the player and changes the game status accordingly.
 
@@ -215,29 +377,46 @@ class Board:
         """
         # Show computer's move to the human player
         if not player.is_human:
-            self.movestatus.config(text=f'Computer\'s move is {position}.')
+            self.movestatus.config(text=Board.MOVE_STRINGS[position])
 
         # Change the board position to the player's marker
-        self.game_board[position // 3][position % 3] = player.marker
-        self.buttons[position // 3][position % 3].config(text=player.marker,
-                                                         fg=player.colour,
-                                                         activeforeground=player.colour)
-
-        # Check if the game has ended either by a player winning or by a tie
-        if self.is_winner(self.players[0]):
-            self.gamestatus.config(text='You won!', fg='#28B463')
+        marker = player.marker
+        colour = player.colour
+        if marker == 'X':
+            bits = self.x_bits = self.x_bits | (1 << position)
+            self.zkey ^= ZOBRIST[0][position]
+        else:
+            bits = self.o_bits = self.o_bits | (1 << position)
+            self.zkey ^= ZOBRIST[1][position]
+        self.buttons[position].config(text=marker,
+                                      fg=colour,
+                                      activeforeground=colour)
+
+        # Check if the game has ended either by a player winning or by a tie,
+        # only the lines passing through the new position can have been completed
+        for mask in LINES_THROUGH[position]:
+            if (bits & mask) == mask:
+                self._winner = player
+                self._ended = True
+                break
+
+        players = self.players
+        winner = self._winner
+        if winner is players[0]:
+            self.set_status('You won!', fg='#28B463')
             return
-        if self.is_winner(self.players[1]):
-            self.gamestatus.config(text='You lost!', fg='#CB4335')
+        if winner is players[1]:
+            self.set_status('You lost!', fg='#CB4335')
             return
         if self.is_tie():
-            self.gamestatus.config(text='Game ended with a tie.', fg='#E67E22')
+            self._ended = True
+            self.set_status('Game ended with a tie.', fg='#E67E22')
             return
 
         # Change the turn
-        if player == self.players[1]:
+        if player == players[1]:
             Board.turn = 0
-        elif player == self.players[0]:
+        elif player == players[0]:
             Board.turn = 1
 
     def is_position_valid(self, position: int):
@@ -253,7 +432,7 @@ class Board:
         bool
             whether the position is valid
         """
-        return self.game_board[position // 3][position % 3] not in ('X', 'O') and 0 <= position <= 8
+        return 0 <= position <= 8 and not ((self.x_bits | self.o_bits) >> position) & 1
 
     def is_winner(self, player: Player):
         """Checks if the player has won the game.
@@ -268,31 +447,8 @@ class Board:
         bool
             whether the player has won the game
         """
-        mark = player.marker
-
-        # Horizontal states
-        for i in range(3):
-            if self.game_board[i][0] == mark:
-                if self.game_board[i][1] == mark and self.game_board[i][2] == mark:
-                    return True
-
-        # Vertical states
-        for i in range(3):
-            if self.game_board[0][i] == mark:
-                if self.game_board[1][i] == mark and self.game_board[2][i] == mark:
-                    return True
-
-        # Diagonal states
-        if self.game_board[0][0] == mark:
-            if self.game_board[1][1] == mark and self.game_board[2][2] == mark:
-                return True
-
-        if self.game_board[0][2] == mark:
-            if self.game_board[1][1] == mark and self.game_board[2][0] == mark:
-                return True
-
-        # Player hasn't won
-        return False
+        bits = self.x_bits if player.marker == 'X' else self.o_bits
+        return has_line(bits)
 
     def is_tie(self):
         """Checks if the game has ended with a tie.
@@ -302,7 +458,7 @@ class Board:
         bool
             whether the game has ended with a tie
         """
-        return all([x in ('X', 'O') for row in self.game_board for x in row])
+        return (self.x_bits | self.o_bits).bit_count() == 9
 
     def game_has_ended(self):
         """Checks if the game has ended either with a player winning or with a tie.
@@ -312,17 +468,7 @@ class Board:
         bool
             whether the game has ended
         """
-        # Check if each player has won
-        for player in self.players:
-            if self.is_winner(player):
-                return True
-
-        # Check if game has ended with a tie
-        if self.is_tie():
-            return True
-
-        # Game hasn't ended
-        return False
+        return self._ended
 
     def pressed(self, position: int):
         """Changes the game status according to the button pressed by the human player.
@@ -344,71 +490,15 @@ class Board:
                 if not self.game_has_ended():
                     if Board.turn == 1:
                         # Announce the human player that it's their turn
-                        self.gamestatus.config(text='It\'s computer\'s turn.')
+                        self.set_status('It\'s computer\'s turn.')
 
                         # Make move for the computer player
-                        move = self.players[1].get_computer_move(self.game_board, self.players[0])
-                        self.make_move(move, players[1])
+                        move = self.players[1].get_computer_move(self)
+                        self.make_move(move, self.players[1])
 
                         if not self.game_has_ended():
                             # Announce the human player that it's their turn
-                            self.gamestatus.config(text='It\'s your turn.')
-
-
-def find_winning_move(player: Player, board: list[list]) -> int:
-    """
-    This function will find which move should a player make to win. It will help the computer
-    decide how to win or how to prevent the player from winning.
-    """
-
-    mark = player.marker
-    other_mark = ''
-    if mark == 'X':
-        other_mark = 'O'
-    if mark == 'O':
-        other_mark = 'X'
-
-    # Horizontal states
-    for i in range(3):
-        if board[i][0] == mark:
-            if board[i][1] == mark and board[i][2] != other_mark:
-                return i * 3 + 2
-            if board[i][2] == mark and board[i][1] != other_mark:
-                return i * 3 + 1
-        if board[i][0] != other_mark:
-            if board[i][1] == mark and board[i][2] == mark:
-                return i * 3
-
-    # Vertical states
-    for i in range(3):
-        if board[0][i] == mark:
-            if board[1][i] == mark and board[2][i] != other_mark:
-                return i + 6
-            if board[2][i] == mark and board[1][i] != other_mark:
-                return i + 3
-        if board[0][i] != other_mark:
-            if board[1][i] == mark and board[2][i] == mark:
-                return i
-
-    # Diagonal states
-    if board[0][0] == mark:
-        if board[1][1] == mark and board[2][2] != other_mark:
-            return 8
-        if board[2][2] == mark and board[1][1] != other_mark:
-            return 4
-    if board[0][0] != other_mark:
-        if board[1][1] == mark and board[2][2] == mark:
-            return 0
-
-    # Diagonal states
-    if board[0][2] == mark:
-        if board[1][1] == mark and board[2][0] != other_mark:
-            return 6
-        if board[2][0] == mark and board[1][1] != other_mark:
-            return 4
-    if board[0][2] != other_mark:
-        if board[1][1] == mark and board[2][0] == mark:
-            return 2
+                            self.set_status('It\'s your turn.')
 
 
 if __name__ == '__main__':